@@ -1,7 +1,7 @@
 # Banana (Balatro‑like) — Pygame Enhanced
 # One‑file prototype with Jokers, Upgrades, Shop, and High Score (JSON).
 # --- What’s new ---
-# ✓ Joker system (Strategy pattern)  ✓ Upgrades (hand size, redraws, joker slots)
+# ✓ Joker system (data-driven spec table)  ✓ Upgrades (hand size, redraws, joker slots)
 # ✓ Simple Shop UI (press S at any time; auto‑opens after clearing goal)  ✓ Coins from scoring
 # ✓ High Score save/load (banana_highscores.json)
 #
@@ -12,10 +12,10 @@
 # - Keep it simple/robust for classroom demos; feel free to tweak numbers easily.
 #
 # Data Structures Demonstrated (for Data Structure course):
-# - Queue (Deque): Deck for FIFO draw operations (O(n) popleft using list shift)
+# - Queue (Deque): Deck for FIFO draw operations (amortized O(1) popleft using a head index)
 # - Stack (list): Discard pile for LIFO toss operations
-# - Hash Table (Counter): Hand evaluation for O(1) average counting of ranks/suits
-# - Set: Uniqueness checks in poker hand detection (e.g., straight, royal flush)
+# - Hash Table (dict): Precomputed hand-rank lookup tables for O(1) average hand evaluation
+# - Bitmask (int): Cactus-Kev card encoding for flush/straight detection (e.g., straight, royal flush)
 
 """
 Data Structures Summary for Course Submission:
@@ -25,31 +25,37 @@ All DS are custom-built from Python primitives (lists/dicts) to show internal me
 
 - Deque (Custom Class):
   - Purpose: FIFO queue for card deck.
-  - Implementation: Uses a list; append() is O(1), popleft() is O(n) due to element shifting.
-  - Why Custom: Demonstrates queue internals; real deque would be O(1) with linked list.
+  - Implementation: Uses a list plus a head index; append() is O(1), popleft() just advances
+    the head (amortized O(1)) and compacts the list once more than half of it is consumed.
+  - Why Custom: Demonstrates queue internals; avoids the O(n) shift of list.pop(0).
   - Usage: Deck.draw()
 
-- Counter (Custom Class):
-  - Purpose: Hash table for counting card ranks/suits in hand evaluation.
-  - Implementation: Inherits from dict; manual increment for O(1) average access.
-  - Why Custom: Shows hash table behavior without library dependency.
+- Hand-Rank Tables (dict):
+  - Purpose: Hash tables mapping every distinct 5-card hand to its kind.
+  - Implementation: Built once at import; FLUSH_RANK is keyed by the 13-bit rank mask
+    (1287 entries), UNFLUSH_RANK by the product of rank primes (6175 entries).
+  - Why: The 7462 equivalence classes are enumerated once, so evaluation is one lookup.
   - Usage: eval_hand() for poker hand detection.
 
 - DefaultDict (Custom Class):
   - Purpose: Dictionary with automatic default values for grouping.
   - Implementation: Subclasses dict with __missing__ for auto-creation.
   - Why Custom: Avoids KeyError in grouping operations.
-  - Usage: Deck view for sorting cards by suit.
+  - Usage: Deck.by_suit() grouping for the deck view.
 
 - List (Built-in):
   - Purpose: Stack for discard pile (LIFO) and undo system.
   - Why: Simple, efficient for small stacks; demonstrates LIFO without custom class.
   - Usage: Deck.toss().
 
-- Set (Built-in):
-  - Purpose: Uniqueness checks in straight/royal flush detection.
-  - Why: Fast membership testing (O(1) average).
-  - Usage: _is_straight(), _is_royal().
+- Bitmask / Prime Encoding (int):
+  - Purpose: Cactus-Kev style card encoding for 5-card hand evaluation.
+  - Implementation: Each card packs a rank bit, rank index, suit bit and rank prime into one int;
+    AND-ing suit bits detects a flush, OR-ing rank bits gives a 13-bit mask matched against
+    precomputed straight masks, and the product of rank primes keys the hand-rank tables.
+    Partial hands (1-4 cards) use the same prime-product key into PARTIAL_RANK.
+  - Why: Replaces sorting/set building with a handful of integer operations.
+  - Usage: Card.code, eval_hand().
 
 Overall: Code emphasizes DS efficiency, trade-offs (e.g., O(n) vs. O(1)), and practical application.
 Run with: python banana_pygame_starter.py
@@ -60,42 +66,73 @@ import sys
 import random
 import json
 import os
+import functools
+from bisect import insort
+from itertools import combinations_with_replacement, islice
+from math import prod
+from operator import attrgetter, itemgetter
 from dataclasses import dataclass, field
 from typing import List, Dict, Tuple, Optional
-from copy import deepcopy
+
+try:
+    import orjson  # optional: faster high-score save/load
+except ImportError:
+    orjson = None
+
+try:
+    import numpy as np  # optional: deck shuffles as one C-level permutation
+except ImportError:
+    np = None
 
 # Custom Data Structures (implemented from scratch for DS course demonstration)
 class Deque:
     """Custom deque implementation using a list for FIFO operations.
-    Uses a list for storage; popleft shifts elements for FIFO behavior (O(n) time)."""
+    Uses a list for storage plus a head index; popleft advances the head instead of
+    shifting elements, and the consumed prefix is dropped once it exceeds half the list
+    (amortized O(1) time)."""
     def __init__(self, iterable=None):
         self.items = list(iterable) if iterable else []
+        self._head = 0
     
     def append(self, item):
         self.items.append(item)
     
     def popleft(self):
-        if not self.items:
+        if self._head >= len(self.items):
             raise IndexError("pop from empty deque")
-        return self.items.pop(0)  # Shift elements (O(n))
+        item = self.items[self._head]
+        self._head += 1
+        if self._head * 2 > len(self.items):
+            # Compact: drop the consumed prefix in one O(n) pass every ~n pops
+            del self.items[:self._head]
+            self._head = 0
+        return item
+    
+    def shuffle(self, rng: random.Random):
+        # Drop the consumed prefix, then shuffle the remaining items in place
+        if self._head:
+            del self.items[:self._head]
+            self._head = 0
+        rng.shuffle(self.items)
+    
+    def reorder(self, order: List[int]):
+        # Rearrange the remaining items so position i holds the old item order[i]
+        if self._head:
+            del self.items[:self._head]
+            self._head = 0
+        if len(order) > 1:
+            # itemgetter gathers in C; with one index it returns the bare item, and that case is a no-op
+            self.items = list(itemgetter(*order)(self.items))
     
     def __len__(self):
-        return len(self.items)
+        return len(self.items) - self._head
     
-    def __iter__(self):
-        return iter(self.items)
-
-class Counter(dict):
-    """Custom counter implementation using a dict for counting.
-    Inherits from dict; increments counts manually for hash table behavior."""
-    def __init__(self, iterable=None):
-        super().__init__()
-        if iterable:
-            for item in iterable:
-                self[item] = self.get(item, 0) + 1
+    def __bool__(self):
+        return len(self.items) > self._head
     
-    def __missing__(self, key):
-        return 0  # For safe access like Counter
+    def __iter__(self):
+        # Walk the live items in place rather than copying them into a slice first
+        return islice(self.items, self._head, None)
 
 class DefaultDict(dict):
     """Custom defaultdict implementation using a dict with factory.
@@ -145,41 +182,86 @@ def get_blind_goal(round_no: int) -> int:
 # -------------------------- Card System --------------------------
 SUITS = ["♠", "♥", "♦", "♣"]
 RANKS = ["A", "2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K"]
-RANK_VALUE = {r: i for i, r in enumerate(["A","2","3","4","5","6","7","8","9","10","J","Q","K"], start=1)}
-CARD_CHIPS = {"A": 11, "2": 2, "3": 3, "4": 4, "5": 5, "6": 6, "7": 7, "8": 8, "9": 9, "10": 10, "J": 10, "Q": 10, "K": 10}
+# Indexed by rank_idx (position in RANKS)
+RANK_VALUE = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13]
+CARD_CHIPS = [11, 2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10]
+
+# Cactus-Kev style card encoding (one int per card):
+#   bits 16-28: rank bit (deuce = bit 16 ... ace = bit 28)
+#   bits 12-15: poker rank (deuce = 0 ... ace = 12)
+#   bits  8-11: suit bit
+#   bits  0-7 : rank prime (deuce = 2 ... ace = 41)
+RANK_PRIMES = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41]
+SUIT_BITS = {"♠": 0x100, "♥": 0x200, "♦": 0x400, "♣": 0x800}
+
+def _card_int(suit_idx: int, rank_idx: int) -> int:
+    r = (14 if rank_idx == 0 else RANK_VALUE[rank_idx]) - 2
+    return (1 << (16 + r)) | (r << 12) | SUIT_BITS[SUITS[suit_idx]] | RANK_PRIMES[r]
+
+CARD_INT = {(s, r): _card_int(s, r) for s in range(len(SUITS)) for r in range(len(RANKS))}
 
 @dataclass(frozen=True)
 class Card:
-    suit: str
-    rank: str
+    suit_idx: int  # index into SUITS
+    rank_idx: int  # index into RANKS
+    code: int = field(init=False, repr=False, compare=False)
+    value: int = field(init=False, repr=False, compare=False)  # sort value, ace high (14)
+    def __post_init__(self):
+        object.__setattr__(self, "code", CARD_INT[(self.suit_idx, self.rank_idx)])
+        object.__setattr__(self, "value", 14 if self.rank_idx == 0 else RANK_VALUE[self.rank_idx])
+    @property
+    def suit(self) -> str:
+        return SUITS[self.suit_idx]
+    @property
+    def rank(self) -> str:
+        return RANKS[self.rank_idx]
     def show(self) -> str:
-        return f"{self.rank}{self.suit}"
-    def value(self) -> int:
-        v = RANK_VALUE[self.rank]
-        return 14 if self.rank == "A" else v
+        return f"{RANKS[self.rank_idx]}{SUITS[self.suit_idx]}"
+
+# Sort keys read precomputed attributes instead of calling a lambda per comparison
+BY_VALUE = attrgetter("value")
+BY_SUIT_VALUE = attrgetter("suit_idx", "value")
+
+# Built once; Card is frozen, so the same instances are shared by every deck/run
+STANDARD_DECK: Tuple[Card, ...] = tuple(Card(s, r) for s in range(len(SUITS)) for r in range(len(RANKS)))
 
 @dataclass
 class Deck:
-    # Using Deque as a queue for FIFO draw operations (O(n) popleft)
+    # Using Deque as a queue for FIFO draw operations (amortized O(1) popleft)
     # This demonstrates queue data structure usage in card drawing
     cards: Deque = field(default_factory=Deque)
     discard: List[Card] = field(default_factory=list)
     rng: random.Random = field(default_factory=random.Random)
+    # numpy Generator seeded from rng on first shuffle (only when numpy is installed)
+    _np_rng: Optional[object] = field(default=None, init=False, repr=False)
+    # suit -> remaining cards, highest first; None until requested or after the deck changes
+    _by_suit: Optional[Dict[str, List[Card]]] = field(default=None, init=False, repr=False)
 
     def build_standard(self):
-        cards_list = []
-        for s in SUITS:
-            for r in RANKS:
-                cards_list.append(Card(s, r))
-        self.cards = Deque(cards_list)
+        self.cards = Deque(STANDARD_DECK)
         self.discard.clear()
+        self._by_suit = None
         self.shuffle()
 
+    def by_suit(self) -> Dict[str, List[Card]]:
+        # Grouping ignores draw order, so shuffles keep it valid; only draw/recycle rebuild it
+        if self._by_suit is None:
+            groups = DefaultDict(list)
+            for c in self.cards:
+                groups[c.suit].append(c)
+            for cs in groups.values():
+                cs.sort(key=BY_VALUE, reverse=True)
+            self._by_suit = groups
+        return self._by_suit
+
     def shuffle(self):
-        # Convert to list for shuffling, then back to deque
-        temp = list(self.cards)
-        self.rng.shuffle(temp)
-        self.cards = Deque(temp)
+        if np is None:
+            self.cards.shuffle(self.rng)
+            return
+        if self._np_rng is None:
+            # Seeded from rng, so a seeded Deck still shuffles reproducibly
+            self._np_rng = np.random.default_rng(self.rng.getrandbits(64))
+        self.cards.reorder(self._np_rng.permutation(len(self.cards)).tolist())
 
     def draw(self, n: int) -> List[Card]:
         out = []
@@ -187,6 +269,8 @@ class Deck:
             if not self.cards:
                 break  # No recycling during round; discarded cards stay out
             out.append(self.cards.popleft())  # O(1) FIFO dequeue
+        if out:
+            self._by_suit = None
         return out
 
     def toss(self, cards: List[Card]):
@@ -200,24 +284,29 @@ class Deck:
         # Add discarded cards back to deck
         while self.discard:
             self.cards.append(self.discard.pop())
+        self._by_suit = None
         self.shuffle()
 
 @dataclass
 class Hand:
     cards: List[Card] = field(default_factory=list)
     max_size: int = 8
+    # True once new cards arrive; removing cards keeps a sorted hand sorted
+    _sort_dirty: bool = field(default=True, init=False, repr=False)
 
     def add(self, cs: List[Card]):
         space = self.max_size - len(self.cards)
         if space > 0:
             self.cards.extend(cs[:space])
+            self._sort_dirty = True
 
     def remove_indices(self, idxs: List[int]) -> List[Card]:
-        removed, keep = [], []
-        idxs_set = set(idxs)
-        for i, c in enumerate(self.cards):
-            (removed if i in idxs_set else keep).append(c)
-        self.cards = keep
+        # Byte mask by position instead of hashing every index into a set
+        mask = bytearray(len(self.cards))
+        for i in idxs:
+            mask[i] = 1
+        removed = [c for i, c in enumerate(self.cards) if mask[i]]
+        self.cards = [c for i, c in enumerate(self.cards) if not mask[i]]
         return removed
 
     def clear(self) -> List[Card]:
@@ -226,10 +315,12 @@ class Hand:
         return out
 
     def sort_by_rank(self):
-        self.cards.sort(key=lambda c: c.value(), reverse=True)
+        self.cards.sort(key=BY_VALUE, reverse=True)
+        self._sort_dirty = False
 
     def sort_by_suit(self):
-        self.cards.sort(key=lambda c: (SUITS.index(c.suit), c.value()), reverse=True)
+        self.cards.sort(key=BY_SUIT_VALUE, reverse=True)
+        self._sort_dirty = False
 
 # ---------------------- Poker Evaluation -------------------------
 BASE_TABLE = {
@@ -245,85 +336,78 @@ BASE_TABLE = {
     "Royal Flush": (100, 8.0),
 }
 
-def eval_hand(cards: List[Card]) -> Tuple[str, int, float]:
-    n = len(cards)
+# 13-bit rank masks (bit 0 = deuce), lowest straight first: wheel A-2-3-4-5, then 2-6 up to 10-A
+STRAIGHT_MASKS = (0b1000000001111,) + tuple(0b11111 << i for i in range(9))
+ROYAL_MASK = STRAIGHT_MASKS[-1]
+
+def _kind_from_counts(counts: List[int]) -> str:
+    # counts: cards per rank, sorted descending (straights/flushes are handled separately)
+    if counts[0] == 4:
+        return "Four of a Kind"
+    if counts[0] == 3:
+        return "Full House" if len(counts) > 1 and counts[1] == 2 else "Three of a Kind"
+    if counts[0] == 2:
+        return "Two Pair" if len(counts) > 1 and counts[1] == 2 else "Pair"
+    return "High Card"
+
+def _build_rank_tables() -> Tuple[Dict[int, str], Dict[int, str]]:
+    # Enumerate all 7462 distinct 5-card hands once:
+    #   flush hands    -> keyed by 13-bit rank mask (1287 entries)
+    #   unflushed hands -> keyed by product of rank primes (6175 entries)
+    flush_rank, unflush_rank = {}, {}
+    for ranks in combinations_with_replacement(range(13), 5):
+        counts = sorted((ranks.count(r) for r in set(ranks)), reverse=True)
+        if counts[0] == 5:
+            continue
+        product = prod(RANK_PRIMES[r] for r in ranks)
+        if counts[0] == 1:
+            mask = sum(1 << r for r in ranks)
+            if mask in STRAIGHT_MASKS:
+                flush_rank[mask] = "Royal Flush" if mask == ROYAL_MASK else "Straight Flush"
+                unflush_rank[product] = "Straight"
+            else:
+                flush_rank[mask] = "Flush"
+                unflush_rank[product] = "High Card"
+            continue
+        unflush_rank[product] = _kind_from_counts(counts)
+    return flush_rank, unflush_rank
+
+def _build_partial_table() -> Dict[int, str]:
+    # Every 1-4 card rank multiset -> kind, keyed by product of rank primes (2379 entries)
+    table = {}
+    for n in range(1, 5):
+        for ranks in combinations_with_replacement(range(13), n):
+            counts = sorted((ranks.count(r) for r in set(ranks)), reverse=True)
+            table[prod(RANK_PRIMES[r] for r in ranks)] = _kind_from_counts(counts)
+    return table
+
+FLUSH_RANK, UNFLUSH_RANK = _build_rank_tables()
+PARTIAL_RANK = _build_partial_table()
+
+@functools.lru_cache(maxsize=4096)
+def eval_hand(codes: Tuple[int, ...]) -> Tuple[str, int, float]:
+    # codes: Card.code of each played card, sorted so equal hands share a cache entry
+    n = len(codes)
     if n == 0:
         return ("Incomplete", 0, 0.0)
 
-    vals = []
-    for c in cards:
-        vals.append(c.value())
-    vals = sorted(vals)
-    vals_ace_low = []
-    for c in cards:
-        if c.rank == "A":
-            vals_ace_low.append(1)
-        else:
-            vals_ace_low.append(c.value())
-    vals_ace_low = sorted(vals_ace_low)
-    # Using Counter (hash table) for efficient counting operations
-    rank_counts = Counter(c.rank for c in cards)
-    suit_counts = Counter(c.suit for c in cards)
-
-    counts = sorted(rank_counts.values(), reverse=True)
-
     # 5 ใบ: ตรวจครบทุกชนิด (รวม Straight/Flush)
-    if n >= 5:
-        is_flush = max(suit_counts.values(), default=0) == 5
-        is_straight = _is_straight(vals) or _is_straight(vals_ace_low)
-        if is_straight and is_flush and _is_royal(vals):
-            kind = "Royal Flush"
-        elif is_straight and is_flush:
-            kind = "Straight Flush"
-        elif counts[0] == 4:
-            kind = "Four of a Kind"
-        elif counts[0] == 3 and counts[1] == 2:
-            kind = "Full House"
-        elif is_flush:
-            kind = "Flush"
-        elif is_straight:
-            kind = "Straight"
-        elif counts[0] == 3:
-            kind = "Three of a Kind"
-        elif counts[0] == 2 and counts[1] == 2:
-            kind = "Two Pair"
-        elif counts[0] == 2:
-            kind = "Pair"
+    if n == 5:
+        c0, c1, c2, c3, c4 = codes
+        if c0 & c1 & c2 & c3 & c4 & 0xF00:
+            kind = FLUSH_RANK[(c0 | c1 | c2 | c3 | c4) >> 16]
         else:
-            kind = "High Card"
+            kind = UNFLUSH_RANK[(c0 & 0xFF) * (c1 & 0xFF) * (c2 & 0xFF) * (c3 & 0xFF) * (c4 & 0xFF)]
     else:
         # 1–4 ใบ: เลือกชนิดที่เป็นไปได้สูงสุดตามจำนวนไพ่
-        if counts[0] == 4:
-            kind = "Four of a Kind"
-        elif n == 4 and counts[0] == 3:
-            kind = "Three of a Kind"
-        elif n == 4 and counts[0] == 2 and counts[1] == 2:
-            kind = "Two Pair"
-        elif (n in (3,4)) and counts[0] == 3:
-            kind = "Three of a Kind"
-        elif (n in (2,3,4)) and counts[0] == 2 and (n == 3 or (n == 4 and counts[1] != 2)):
-            kind = "Pair"
-        elif n == 2 and counts[0] == 2:
-            kind = "Pair"
-        else:
-            kind = "High Card"
+        product = 1
+        for c in codes:
+            product *= c & 0xFF
+        kind = PARTIAL_RANK[product]
 
     chips, mult = BASE_TABLE.get(kind, (0, 0.0))
     return (kind, chips, mult)
 
-def _is_royal(vals: List[int]) -> bool:
-    s = set(vals)
-    return {10, 11, 12, 13, 14}.issubset(s)
-def _is_straight(vals: List[int]) -> bool:
-    uniq = sorted(set(vals))
-    if len(uniq) < 5:
-        return False
-    for i in range(len(uniq) - 4):
-        window = uniq[i:i+5]
-        if all(window[j] + 1 == window[j+1] for j in range(4)):
-            return True
-    return False
-
 
 # ----------------------- Joker / Upgrades ------------------------
 @dataclass
@@ -333,139 +417,57 @@ class ScoreContext:
     hand_type: str
     cards: List[Card]
     coins: int = 0
+    suit_mask: int = 0  # SUIT_BITS of the played cards, filled once before jokers run
+
+# Hand kinds as bit positions, so a joker's trigger is a single mask test
+HAND_KIND_BIT = {kind: 1 << i for i, kind in enumerate(BASE_TABLE)}
+ANY_HAND = (1 << len(BASE_TABLE)) - 1
 
-class Joker:
-    name: str = "Joker"
-    desc: str = ""
-    price: int = 10
-    def apply(self, ctx: ScoreContext):
-        pass
-
-class BaseJoker(Joker):
-    name = "Joker"
-    desc = "+4 Mult"
-    price = 10
-    def apply(self, ctx: ScoreContext):
-        ctx.base_mult += 4
-
-class GreedyJoker(Joker):
-    name = "Greedy Joker"
-    desc = "+4 Mult when a Diamond is played"
-    price = 15
-    def apply(self, ctx: ScoreContext):
-        if any(c.suit == "♦" for c in ctx.cards):
-            ctx.base_mult += 4
-
-class LustyJoker(Joker):
-    name = "Lusty Joker"
-    desc = "+4 Mult when a Heart is played"
-    price = 15
-    def apply(self, ctx: ScoreContext):
-        if any(c.suit == "♥" for c in ctx.cards):
-            ctx.base_mult += 4
-
-class WrathfulJoker(Joker):
-    name = "Wrathful Joker"
-    desc = "+4 Mult when a Spade is played"
-    price = 15
-    def apply(self, ctx: ScoreContext):
-        if any(c.suit == "♠" for c in ctx.cards):
-            ctx.base_mult += 4
-
-class GluttonousJoker(Joker):
-    name = "Gluttonous Joker"
-    desc = "+4 Mult when a Club is played"
-    price = 15
-    def apply(self, ctx: ScoreContext):
-        if any(c.suit == "♣" for c in ctx.cards):
-            ctx.base_mult += 4
-
-class JollyJoker(Joker):
-    name = "Jolly Joker"
-    desc = "+8 Mult if the hand is a Pair"
-    price = 20
-    def apply(self, ctx: ScoreContext):
-        if ctx.hand_type == "Pair":
-            ctx.base_mult += 8
-
-class ZanyJoker(Joker):
-    name = "Zany Joker"
-    desc = "+8 Mult if the hand is a Three of a Kind"
-    price = 25
-    def apply(self, ctx: ScoreContext):
-        if ctx.hand_type == "Three of a Kind":
-            ctx.base_mult += 8
-
-class MadJoker(Joker):
-    name = "Mad Joker"
-    desc = "+20 Mult if the hand is a Four of a Kind"
-    price = 30
-    def apply(self, ctx: ScoreContext):
-        if ctx.hand_type == "Four of a Kind":
-            ctx.base_mult += 20
-
-class CrazyJoker(Joker):
-    name = "Crazy Joker"
-    desc = "+12 Mult if the hand is a Straight"
-    price = 25
-    def apply(self, ctx: ScoreContext):
-        if ctx.hand_type == "Straight":
-            ctx.base_mult += 12
-
-class DrollJoker(Joker):
-    name = "Droll Joker"
-    desc = "+10 Mult if the hand is a Flush"
-    price = 25
-    def apply(self, ctx: ScoreContext):
-        if ctx.hand_type == "Flush":
-            ctx.base_mult += 10
-
-class SlyJoker(Joker):
-    name = "Sly Joker"
-    desc = "+50 Chips if the hand is a Pair"
-    price = 20
-    def apply(self, ctx: ScoreContext):
-        if ctx.hand_type == "Pair":
-            ctx.base_chips += 50
-
-class WilyJoker(Joker):
-    name = "Wily Joker"
-    desc = "+100 Chips if the hand is a Three of a Kind"
-    price = 25
-    def apply(self, ctx: ScoreContext):
-        if ctx.hand_type == "Three of a Kind":
-            ctx.base_chips += 100
-
-class CleverJoker(Joker):
-    name = "Clever Joker"
-    desc = "+150 Chips if the hand is a Four of a Kind"
-    price = 30
-    def apply(self, ctx: ScoreContext):
-        if ctx.hand_type == "Four of a Kind":
-            ctx.base_chips += 150
-
-class DeviousJoker(Joker):
-    name = "Devious Joker"
-    desc = "+100 Chips if the hand is a Straight"
-    price = 25
-    def apply(self, ctx: ScoreContext):
-        if ctx.hand_type == "Straight":
-            ctx.base_chips += 100
-
-class CraftyJoker(Joker):
-    name = "Crafty Joker"
-    desc = "+80 Chips if the hand is a Flush"
-    price = 25
-    def apply(self, ctx: ScoreContext):
-        if ctx.hand_type == "Flush":
-            ctx.base_chips += 80
-
-class TheMaskJoker(Joker):
-    name = "The Mask"
-    desc = "+5 Mult"
-    price = 20
-    def apply(self, ctx: ScoreContext):
-        ctx.base_mult += 5
+@dataclass(frozen=True)
+class JokerSpec:
+    name: str
+    desc: str
+    price: int
+    hand_mask: int = ANY_HAND  # HAND_KIND_BITs that trigger the joker
+    suit_req: int = 0          # SUIT_BITS that must appear among the played cards
+    d_chips: int = 0
+    d_mult: int = 0
+
+# Joker id (index) -> effect; Player.jokers stores these small ints
+JOKER_SPEC: Tuple[JokerSpec, ...] = (
+    JokerSpec("Joker", "+4 Mult", 10, d_mult=4),
+    JokerSpec("Greedy Joker", "+4 Mult when a Diamond is played", 15, suit_req=SUIT_BITS["♦"], d_mult=4),
+    JokerSpec("Lusty Joker", "+4 Mult when a Heart is played", 15, suit_req=SUIT_BITS["♥"], d_mult=4),
+    JokerSpec("Wrathful Joker", "+4 Mult when a Spade is played", 15, suit_req=SUIT_BITS["♠"], d_mult=4),
+    JokerSpec("Gluttonous Joker", "+4 Mult when a Club is played", 15, suit_req=SUIT_BITS["♣"], d_mult=4),
+    JokerSpec("Jolly Joker", "+8 Mult if the hand is a Pair", 20, hand_mask=HAND_KIND_BIT["Pair"], d_mult=8),
+    JokerSpec("Zany Joker", "+8 Mult if the hand is a Three of a Kind", 25, hand_mask=HAND_KIND_BIT["Three of a Kind"], d_mult=8),
+    JokerSpec("Mad Joker", "+20 Mult if the hand is a Four of a Kind", 30, hand_mask=HAND_KIND_BIT["Four of a Kind"], d_mult=20),
+    JokerSpec("The Mask", "+5 Mult", 20, d_mult=5),
+    JokerSpec("Crazy Joker", "+12 Mult if the hand is a Straight", 25, hand_mask=HAND_KIND_BIT["Straight"], d_mult=12),
+    JokerSpec("Droll Joker", "+10 Mult if the hand is a Flush", 25, hand_mask=HAND_KIND_BIT["Flush"], d_mult=10),
+    JokerSpec("Sly Joker", "+50 Chips if the hand is a Pair", 20, hand_mask=HAND_KIND_BIT["Pair"], d_chips=50),
+    JokerSpec("Wily Joker", "+100 Chips if the hand is a Three of a Kind", 25, hand_mask=HAND_KIND_BIT["Three of a Kind"], d_chips=100),
+    JokerSpec("Clever Joker", "+150 Chips if the hand is a Four of a Kind", 30, hand_mask=HAND_KIND_BIT["Four of a Kind"], d_chips=150),
+    JokerSpec("Devious Joker", "+100 Chips if the hand is a Straight", 25, hand_mask=HAND_KIND_BIT["Straight"], d_chips=100),
+    JokerSpec("Crafty Joker", "+80 Chips if the hand is a Flush", 25, hand_mask=HAND_KIND_BIT["Flush"], d_chips=80),
+)
+
+# Struct-of-arrays view of JOKER_SPEC, indexed by joker id, for the scoring loop
+JOKER_HAND_MASK = tuple(spec.hand_mask for spec in JOKER_SPEC)
+JOKER_SUIT_REQ = tuple(spec.suit_req for spec in JOKER_SPEC)
+JOKER_CHIPS = tuple(spec.d_chips for spec in JOKER_SPEC)
+JOKER_MULT = tuple(spec.d_mult for spec in JOKER_SPEC)
+
+def apply_jokers(ctx: ScoreContext, jokers: List[int]):
+    hand_bit = HAND_KIND_BIT.get(ctx.hand_type, 0)
+    played_suits = ctx.suit_mask
+    for j in jokers:
+        req = JOKER_SUIT_REQ[j]
+        # Branchless: ok is 0/1 and scales the bonus instead of guarding it
+        ok = bool(JOKER_HAND_MASK[j] & hand_bit) & (req & played_suits == req)
+        ctx.base_chips += ok * JOKER_CHIPS[j]
+        ctx.base_mult += ok * JOKER_MULT[j]
 
 # ---- Upgrades (per run) ----
 @dataclass
@@ -479,7 +481,7 @@ class Upgrades:
 class Player:
     deck: Deck
     hand: Hand = field(default_factory=Hand)
-    jokers: List[Joker] = field(default_factory=list)
+    jokers: List[int] = field(default_factory=list)  # JOKER_SPEC indices
     joker_slots: int = 5
     score: int = 0
     coins: int = 0
@@ -541,56 +543,70 @@ BLUE = (66, 135, 245)
 GREEN = (74, 201, 133)
 YELLOW = (240, 206, 88)
 PURPLE = (180, 102, 255)
+SUIT_COLOR = {"♥": RED, "♦": YELLOW, "♣": BLUE, "♠": PURPLE}
 
 
 HS_FILE = "banana_highscores.json"
+HAS_FBLITS = hasattr(pygame.Surface, "fblits")  # pygame-ce only
+# The only events run() reacts to; everything else (mouse motion, key presses) is blocked at the queue
+HANDLED_EVENTS = [pygame.QUIT, pygame.MOUSEBUTTONDOWN, pygame.VIDEOEXPOSE]
 
 class App:
     def __init__(self):
         pygame.init()
         pygame.display.set_caption("Banana — Pygame Enhanced")
         self.screen = pygame.display.set_mode((W, H))
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(HANDLED_EVENTS)
         self.clock = pygame.time.Clock()
         self.font = pygame.font.SysFont("Segoe UI", 24)
         self.big = pygame.font.SysFont("Segoe UI", 32, bold=True)
         self.small = pygame.font.SysFont("Segoe UI", 18)
+        # Rendered text keyed by (font, text, color); see _text()
+        self._text_cache: Dict[Tuple[int, str, Tuple[int, int, int]], pygame.Surface] = {}
+        # HUD field name -> (values shown, rendered surface); see _field()
+        self._hud_fields: Dict[str, Tuple[tuple, pygame.Surface]] = {}
+        # Finished card images keyed by (Card.code, selected); see card_surface()
+        self.card_surfaces: Dict[Tuple[int, bool], pygame.Surface] = {}
+        # Hand card rects keyed by hand length; the window is fixed-size so they never go stale
+        self._layout_cache: Dict[int, List[pygame.Rect]] = {}
+        # Deck view suit lines, rendered for the Deck.by_suit() grouping they came from
+        self._deck_view_src: Optional[Dict[str, List[Card]]] = None
+        self._deck_view_lines: List[Tuple[pygame.Surface, Tuple[int, int]]] = []
 
         self.rng = random.Random()
         self.rng = random.Random()
-        self.full_joker_pool = [
-            (BaseJoker, {}, 10, "Joker", "+4 Mult"),
-            (GreedyJoker, {}, 15, "Greedy Joker", "+4 Mult when a Diamond is played"),
-            (LustyJoker, {}, 15, "Lusty Joker", "+4 Mult when a Heart is played"),
-            (WrathfulJoker, {}, 15, "Wrathful Joker", "+4 Mult when a Spade is played"),
-            (GluttonousJoker, {}, 15, "Gluttonous Joker", "+4 Mult when a Club is played"),
-            (JollyJoker, {}, 20, "Jolly Joker", "+8 Mult if the hand is a Pair"),
-            (ZanyJoker, {}, 25, "Zany Joker", "+8 Mult if the hand is a Three of a Kind"),
-            (MadJoker, {}, 30, "Mad Joker", "+20 Mult if the hand is a Four of a Kind"),
-            (TheMaskJoker, {}, 20, "The Mask", "+5 Mult"),
-            (CrazyJoker, {}, 25, "Crazy Joker", "+12 Mult if the hand is a Straight"),
-            (DrollJoker, {}, 25, "Droll Joker", "+10 Mult if the hand is a Flush"),
-            (SlyJoker, {}, 20, "Sly Joker", "+50 Chips if the hand is a Pair"),
-            (WilyJoker, {}, 25, "Wily Joker", "+100 Chips if the hand is a Three of a Kind"),
-            (CleverJoker, {}, 30, "Clever Joker", "+150 Chips if the hand is a Four of a Kind"),
-            (DeviousJoker, {}, 25, "Devious Joker", "+100 Chips if the hand is a Straight"),
-            (CraftyJoker, {}, 25, "Crafty Joker", "+80 Chips if the hand is a Flush"),
-        ]
-        self.joker_deck = self.full_joker_pool.copy()
+        self.full_joker_pool: Dict[int, JokerSpec] = dict(enumerate(JOKER_SPEC))
+        # Jokers still buyable this run, keyed by id so a purchase is an O(1) pop
+        self.joker_deck: Dict[int, JokerSpec] = dict(self.full_joker_pool)
         self.deck = Deck(rng=self.rng)
         self.deck.build_standard()
         self.player = Player(deck=self.deck)
         self.player.hand.max_size = self.player.effective_hand_size()
         self.game = Game(player=self.player)
 
+        # Selected hand indices, kept in ascending order (see toggle_select)
         self.selected: List[int] = []
         self.message = "Use buttons: New Run, Deal, Play, Redraw."
         self.sort_mode = "rank"  # "rank" or "suit"
+        self._last_sort_mode = None  # mode the hand was last sorted in
         self.shop_items = []  # list of ShopItem
         self.shop_rects: List[pygame.Rect] = []
+        self._shop_item_surfs: List[pygame.Surface] = []
         self.shop_available = False
         self.close_button_rect = pygame.Rect(W//2 - 100, H - 60, 200, 40)
         self.close_deck_button_rect = pygame.Rect(W//2 - 100, H - 60, 200, 40)
+        # Display regions to push this frame (full_redraw = whole window)
+        self.dirty: List[pygame.Rect] = []
+        self.full_redraw = True
+        # Bounding box of everything clickable, cached per (mode, hand size, shop size)
+        self._clickable_bbox: Optional[pygame.Rect] = None
+        self._clickable_key: Optional[Tuple[str, int, int]] = None
+        # Translucent backdrop shared by the SHOP/GAMEOVER/DECK screens
+        self._overlay = pygame.Surface((W, H), pygame.SRCALPHA)
+        self._overlay.fill((0,0,0,160))
         self.load_highscores()
+        self.refresh_joker_lines()
         self.setup_buttons()
 
     def setup_buttons(self):
@@ -607,6 +623,10 @@ class App:
             {"text": "Deck", "rect": pygame.Rect(40 + 5*(button_w + gap), button_y, button_w, button_h), "action": lambda: self.open_deck() if self.game.mode == "PLAY" else self.close_deck()},
             {"text": "Quit", "rect": pygame.Rect(40 + 6*(button_w + gap), button_y, button_w, button_h), "action": lambda: (pygame.quit(), sys.exit(0))},
         ]
+        # Button images depend only on (mode, sort_mode); see refresh_buttons()
+        self._button_key: Optional[Tuple[str, str]] = None
+        # Shop shows at most 2 jokers + 1 upgrade; layouts depend only on the item count
+        self._shop_rects_cache = {n: self.layout_shop(n) for n in range(4)}
 
 
 
@@ -620,44 +640,123 @@ class App:
         self.highscores = []
         if os.path.exists(HS_FILE):
             try:
-                with open(HS_FILE, "r", encoding="utf-8") as f:
-                    self.highscores = json.load(f)
+                if orjson:
+                    with open(HS_FILE, "rb") as f:
+                        self.highscores = orjson.loads(f.read())
+                else:
+                    with open(HS_FILE, "r", encoding="utf-8") as f:
+                        self.highscores = json.load(f)
             except Exception:
                 self.highscores = []
+        self.refresh_highscore_lines()
+
+    def refresh_highscore_lines(self):
+        # HUD preview lines; the table only changes on load and save_highscore()
+        self._highscore_surfs = [self.small.render(f"{i+1}. {e['score']} (R{e['round']})", True, MUTED)
+                                 for i, e in enumerate(self.highscores[:5])]
 
     def save_highscore(self):
         entry = {"score": self.player.score, "round": self.game.round_no}
         self.highscores.append(entry)
         self.highscores = sorted(self.highscores, key=lambda e: (-e["score"], -e["round"]))[:10]
+        self.refresh_highscore_lines()
         try:
-            with open(HS_FILE, "w", encoding="utf-8") as f:
-                json.dump(self.highscores, f, ensure_ascii=False, indent=2)
+            if orjson:
+                with open(HS_FILE, "wb") as f:
+                    f.write(orjson.dumps(self.highscores, option=orjson.OPT_INDENT_2))
+            else:
+                # Compact separators: no indent pass, fewer bytes written
+                with open(HS_FILE, "w", encoding="utf-8") as f:
+                    json.dump(self.highscores, f, separators=(",", ":"))
         except Exception:
             pass
 
 
     # ---------------------- Layout/Helpers -------------------
+    def refresh_joker_lines(self):
+        # HUD joker list; call after self.player.jokers changes
+        self._joker_surfs = [self.small.render(f"• {JOKER_SPEC[j].name}", True, WHITE)
+                             for j in self.player.jokers[:5]]
+
+    def _text(self, font: pygame.font.Font, s: str, col: Tuple[int, int, int]) -> pygame.Surface:
+        # Render each distinct string once; live HUD values go through _field() instead
+        key = (id(font), s, col)
+        surf = self._text_cache.get(key)
+        if surf is None:
+            if len(self._text_cache) >= 512:
+                self._text_cache.clear()
+            surf = self._text_cache[key] = font.render(s, True, col)
+        return surf
+
+    def _field(self, name: str, values: tuple, font: pygame.font.Font, fmt: str, col: Tuple[int, int, int]) -> pygame.Surface:
+        # One slot per HUD field: re-render only when the values it shows (or its color) change
+        cached = self._hud_fields.get(name)
+        if cached is not None and cached[0] == (values, col):
+            return cached[1]
+        surf = font.render(fmt.format(*values), True, col)
+        self._hud_fields[name] = ((values, col), surf)
+        return surf
+
+    def blit_many(self, seq: List[Tuple[pygame.Surface, Tuple[int, int]]]):
+        # One C call for the whole batch (fblits on pygame-ce, blits elsewhere)
+        if HAS_FBLITS:
+            self.screen.fblits(seq)
+        else:
+            self.screen.blits(seq, doreturn=False)
+
     def layout_hand(self) -> List[pygame.Rect]:
-        rects = []
         n = len(self.player.hand.cards)
+        rects = self._layout_cache.get(n)
+        if rects is None:
+            rects = self._layout_cache[n] = self.compute_hand_layout(n)
+        return rects
+
+    def compute_hand_layout(self, n: int) -> List[pygame.Rect]:
+        rects = []
         start_x = (W - (n * CARD_W + (n - 1) * SPACING)) // 2
         for i in range(n):
             x = start_x + i * (CARD_W + SPACING)
             rects.append(pygame.Rect(x, TOP_Y, CARD_W, CARD_H))
         return rects
 
+    def clickable_bbox(self) -> pygame.Rect:
+        mode = self.game.mode
+        key = (mode, len(self.player.hand.cards), len(self.shop_rects))
+        if key != self._clickable_key:
+            rects = [btn["rect"] for btn in self.buttons]
+            if mode == "PLAY":
+                rects.extend(self.layout_hand())
+            elif mode == "SHOP":
+                rects.extend(self.shop_rects)
+                rects.append(self.close_button_rect)
+            elif mode == "DECK":
+                rects.append(self.close_deck_button_rect)
+            self._clickable_bbox = rects[0].unionall(rects[1:])
+            self._clickable_key = key
+        return self._clickable_bbox
+
+    def invalidate(self, rect: Optional[pygame.Rect] = None):
+        # Mark a display region as changed; no rect means the whole window
+        if rect is None:
+            self.full_redraw = True
+        else:
+            self.dirty.append(rect)
+
     def toggle_select(self, i: int):
         if i in self.selected:
             self.selected.remove(i)
         else:
-            self.selected.append(i)
+            insort(self.selected, i)
 
     def sort_hand(self):
+        if not self.player.hand._sort_dirty and self._last_sort_mode == self.sort_mode:
+            return  # already sorted in this mode
         if self.sort_mode == "rank":
             self.player.hand.sort_by_rank()
         elif self.sort_mode == "suit":
             self.player.hand.sort_by_suit()
         # "none" does nothing - keeps original order
+        self._last_sort_mode = self.sort_mode
 
 
 
@@ -668,9 +767,8 @@ class App:
         name: str
         desc: str
         price: int
-        factory: Optional[callable] = None  # for joker creation
         apply_upgrade: Optional[callable] = None
-        cls: Optional[type] = None  # for joker class
+        joker_id: Optional[int] = None  # JOKER_SPEC index
     def open_shop(self):
         if not self.shop_available:
             self.message = "Shop only available after completing a round"
@@ -701,34 +799,48 @@ class App:
     
     def roll_shop(self):
         items = []
-        # Jokers pool - unique, from current joker_deck
-        joker_pool = self.joker_deck.copy()
         # Upgrades pool
         upgrade_pool = [
             ("Hand +1", "+1 card hand size (permanent this run)", 40, lambda: setattr(self.player.upgrades, "hand_size_bonus", self.player.upgrades.hand_size_bonus+1)),
             ("Redraw +1", "+1 redraw each round", 30, lambda: setattr(self.player.upgrades, "redraw_bonus", self.player.upgrades.redraw_bonus+1)),
             ("Joker Slot +1", "+1 joker slot", 50, lambda: setattr(self.player.upgrades, "joker_slots_bonus", self.player.upgrades.joker_slots_bonus+1)),
         ]
-        # Shuffle the joker pool like a deck of cards
-        self.rng.shuffle(joker_pool)
-        # Draw the top jokers (up to 2)
-        chosen_jokers = joker_pool[:min(2, len(joker_pool))]
-        for cls, kwargs, price, n, d in chosen_jokers:
-            items.append(self.ShopItem("joker", n, d, price, factory=lambda c=cls, kw=kwargs: c(**kw), cls=cls))
+        # Draw up to 2 unique jokers from the current joker_deck (no shuffled copy)
+        chosen_jokers = self.rng.sample(list(self.joker_deck.items()), k=min(2, len(self.joker_deck)))
+        for jid, spec in chosen_jokers:
+            items.append(self.ShopItem("joker", spec.name, spec.desc, spec.price, joker_id=jid))
         upgrade = self.rng.choice(upgrade_pool)
         items.append(self.ShopItem("upgrade", upgrade[0], upgrade[1], upgrade[2], apply_upgrade=upgrade[3]))
         return items
 
-    def build_shop_layout(self):
+    def layout_shop(self, num_items: int) -> List[pygame.Rect]:
         w = 300; h = 120
         gap = 24
-        num_items = len(self.shop_items)
         start_x = (W - (num_items*w + (num_items-1)*gap))//2
         y = 140
-        self.shop_rects = []
+        rects = []
         for i in range(num_items):
             x = start_x + i*(w+gap)
-            self.shop_rects.append(pygame.Rect(x, y, w, h))
+            rects.append(pygame.Rect(x, y, w, h))
+        return rects
+
+    def build_shop_layout(self):
+        self.shop_rects = self._shop_rects_cache[len(self.shop_items)]
+        # shop contents only change on open/purchase, so panels are drawn here once
+        self._shop_item_surfs = [self.render_shop_item(it, r) for it, r in zip(self.shop_items, self.shop_rects)]
+
+    def render_shop_item(self, it: ShopItem, rect: pygame.Rect) -> pygame.Surface:
+        surf = pygame.Surface(rect.size, pygame.SRCALPHA)
+        r = surf.get_rect()
+        pygame.draw.rect(surf, PANEL, r, border_radius=14)
+        pygame.draw.rect(surf, (0,0,0), r, width=2, border_radius=14)
+        name = self.font.render(it.name, True, WHITE)
+        desc = self.small.render(it.desc, True, MUTED)
+        price = self.font.render(f"${it.price}", True, YELLOW)
+        surf.blit(name, (12, 12))
+        surf.blit(desc, (12, 48))
+        surf.blit(price, (r.right-12-price.get_width(), r.bottom-12-price.get_height()))
+        return surf
 
     def click_shop(self, pos):
         if self.close_button_rect.collidepoint(pos):
@@ -745,13 +857,10 @@ class App:
                         self.message = "No joker slot available"
                         return
                     self.player.coins -= it.price
-                    self.player.jokers.append(it.factory())
+                    self.player.jokers.append(it.joker_id)
+                    self.refresh_joker_lines()
                     # Remove the bought joker from the deck
-                    new_joker_deck = []
-                    for t in self.joker_deck:
-                        if t[0].__name__ != it.cls.__name__:
-                            new_joker_deck.append(t)
-                    self.joker_deck = new_joker_deck
+                    self.joker_deck.pop(it.joker_id, None)
                     self.message = f"Bought Joker: {it.name}"
                     # Remove the bought joker from the shop display
                     self.shop_items.remove(it)
@@ -773,7 +882,8 @@ class App:
         self.deck.build_standard()
         self.player.hand = Hand()
         self.player.jokers.clear()
-        self.joker_deck = self.full_joker_pool.copy()  # Reset joker deck
+        self.refresh_joker_lines()
+        self.joker_deck = dict(self.full_joker_pool)  # Reset joker deck
         self.player.upgrades = Upgrades()
         self.player.joker_slots = 5 
         self.player.hand.max_size = self.player.effective_hand_size()
@@ -809,7 +919,7 @@ class App:
             self.message = "Select cards to discard (click)."
             return
         rects = self.layout_hand()
-        removed = self.player.hand.remove_indices(sorted(self.selected))
+        removed = self.player.hand.remove_indices(self.selected)
         self.deck.toss(removed)
         draw_n = len(removed)
         self.player.hand.add(self.deck.draw(draw_n))
@@ -835,17 +945,21 @@ class App:
         if not (1 <= len(self.selected) <= 5):
             self.message = "Select 1–5 cards to play."
             return
-        play_idxs = sorted(self.selected)
+        play_idxs = self.selected
 
 
         # ประเมินชุดไพ่เฉพาะที่เล่น
-        played_cards = [self.player.hand.cards[i] for i in play_idxs]
-        kind, base_chips, mult = eval_hand(played_cards)
-        card_chips = sum(CARD_CHIPS[c.rank] for c in played_cards)
+        hand_cards = self.player.hand.cards
+        played_cards = [hand_cards[i] for i in play_idxs]
+        codes = tuple(sorted(c.code for c in played_cards))
+        kind, base_chips, mult = eval_hand(codes)
+        card_chips = sum(CARD_CHIPS[c.rank_idx] for c in played_cards)
         total_chips = base_chips + card_chips
-        ctx = ScoreContext(total_chips, mult, kind, played_cards[:])
-        for j in self.player.jokers:
-            j.apply(ctx)
+        ctx = ScoreContext(total_chips, mult, kind, played_cards)
+        # Suits played, collected once so suit jokers test a bit instead of rescanning cards
+        for code in codes:
+            ctx.suit_mask |= code & 0xF00
+        apply_jokers(ctx, self.player.jokers)
 
         points = int(ctx.base_chips * ctx.base_mult)
         self.player.score += points
@@ -879,90 +993,82 @@ class App:
 
 
     # ---------------------- Render --------------------------
-    def draw_card(self, rect: pygame.Rect, card: Card, selected: bool):
-        bg = CARD_SEL if selected else CARD_BG
-        pygame.draw.rect(self.screen, bg, rect, border_radius=16)
-        pygame.draw.rect(self.screen, (0,0,0), rect, width=2, border_radius=16)
-        if card.suit in ("♥"):
-            col = RED
-        elif card.suit in ("♦"):
-            col = YELLOW
-        elif card.suit in ("♣"):
-            col = BLUE
-        else:
-            col = PURPLE
-        rank_surf = self.big.render(card.rank, True, col)
-        suit_surf = self.big.render(card.suit, True, col)
-        self.screen.blit(rank_surf, (rect.x + 12, rect.y + 12))
-        self.screen.blit(suit_surf, (rect.x + 12, rect.y + 56))
-
+    def card_surface(self, card: Card, selected: bool) -> pygame.Surface:
+        # Background, border and glyphs composed once per (card, selected); corners stay transparent
+        key = (card.code, selected)
+        surf = self.card_surfaces.get(key)
+        if surf is None:
+            surf = pygame.Surface((CARD_W, CARD_H), pygame.SRCALPHA).convert_alpha()
+            rect = surf.get_rect()
+            bg = CARD_SEL if selected else CARD_BG
+            pygame.draw.rect(surf, bg, rect, border_radius=16)
+            pygame.draw.rect(surf, (0,0,0), rect, width=2, border_radius=16)
+            col = SUIT_COLOR[card.suit]
+            surf.blit(self.big.render(card.rank, True, col), (12, 12))
+            surf.blit(self.big.render(card.suit, True, col), (12, 56))
+            self.card_surfaces[key] = surf
+        return surf
+
+
+    def refresh_buttons(self):
+        # Background, border and label composed into one surface per button
+        mode = self.game.mode
+        for btn in self.buttons:
+            text = "Close Shop" if btn["text"] == "Shop" and mode == "SHOP" else ("Close Deck" if btn["text"] == "Deck" and mode == "DECK" else (f"Sort ({self.sort_mode})" if btn["text"] == "Sort" else btn["text"]))
+            surf = pygame.Surface(btn["rect"].size, pygame.SRCALPHA)
+            r = surf.get_rect()
+            pygame.draw.rect(surf, PANEL, r, border_radius=8)
+            pygame.draw.rect(surf, WHITE, r, width=2, border_radius=8)
+            label = self.font.render(text, True, WHITE)
+            surf.blit(label, (r.centerx - label.get_width()//2, r.centery - label.get_height()//2))
+            btn["surf"] = surf
+        self._button_key = (mode, self.sort_mode)
 
     def draw_hud(self):
         
         panel = pygame.Rect(40, 24, W-80, 220)
         pygame.draw.rect(self.screen, PANEL, panel, border_radius=18)
-        t1 = self.big.render(f"Score: {self.player.score}", True, WHITE)
-        t2 = self.big.render(f"Goal: {self.game.rules.score_goal}", True, GREEN if self.player.score>=self.game.rules.score_goal else WHITE)
-        t3 = self.font.render(f"Round: {self.game.round_no}", True, WHITE)
-        t4 = self.font.render(f"Hands: {self.game.rules.hands_remaining}", True, WHITE)
-        t5 = self.font.render(f"Redraws: {self.game.rules.redraw_remaining}", True, WHITE)
-        t6 = self.big.render(f"Coins: {self.player.coins}", True, YELLOW)
-        t7 = self.font.render(f"Deck: {len(self.deck.cards)}", True, WHITE)
-        t8 = self.font.render(f"Jokers Slots: {len(self.player.jokers)}/{self.player.effective_joker_slots()}", True, WHITE)
-        self.screen.blit(t1, (panel.x+20, panel.y+16))
-        self.screen.blit(t2, (panel.x+20, panel.y+60))
-        self.screen.blit(t3, (panel.x+20, panel.y+104))
-        self.screen.blit(t4, (panel.x+240, panel.y+104))
-        self.screen.blit(t5, (panel.x+420, panel.y+104))
-        self.screen.blit(t6, (panel.x+20, panel.y+148))
-        self.screen.blit(t7, (panel.x+420, panel.y+148))
-        self.screen.blit(t8, (panel.x+240, panel.y+148))
-        msg = self.small.render(self.message, True, MUTED)
-        self.screen.blit(msg, (panel.x+20, panel.bottom - 28))
+        text, field = self._text, self._field
+        player, rules = self.player, self.game.rules
+        seq = [
+            (field("score", (player.score,), self.big, "Score: {}", WHITE), (panel.x+20, panel.y+16)),
+            (field("goal", (rules.score_goal,), self.big, "Goal: {}", GREEN if player.score>=rules.score_goal else WHITE), (panel.x+20, panel.y+60)),
+            (field("round", (self.game.round_no,), self.font, "Round: {}", WHITE), (panel.x+20, panel.y+104)),
+            (field("hands", (rules.hands_remaining,), self.font, "Hands: {}", WHITE), (panel.x+240, panel.y+104)),
+            (field("redraws", (rules.redraw_remaining,), self.font, "Redraws: {}", WHITE), (panel.x+420, panel.y+104)),
+            (field("coins", (player.coins,), self.big, "Coins: {}", YELLOW), (panel.x+20, panel.y+148)),
+            (field("deck", (len(self.deck.cards),), self.font, "Deck: {}", WHITE), (panel.x+420, panel.y+148)),
+            (field("jokers", (len(player.jokers), player.effective_joker_slots()), self.font, "Jokers Slots: {}/{}", WHITE), (panel.x+240, panel.y+148)),
+            (field("message", (self.message,), self.small, "{}", MUTED), (panel.x+20, panel.bottom - 28)),
+        ]
         # jokers list
         jx, jy = panel.right - 360, panel.y + 16
-        self.screen.blit(self.font.render("Jokers:", True, WHITE), (jx, jy))
-        for i, j in enumerate(self.player.jokers[:5]):
-            line = f"• {j.name}"
-            self.screen.blit(self.small.render(line, True, WHITE), (jx, jy + 28 + i*22))
+        seq.append((text(self.font, "Jokers:", WHITE), (jx, jy)))
+        for i, surf in enumerate(self._joker_surfs):
+            seq.append((surf, (jx, jy + 28 + i*22)))
 
         # highscores preview
         hsx = panel.right - 220
-        self.screen.blit(self.font.render("High Score:", True, WHITE), (hsx, jy))
-        for i, e in enumerate(self.highscores[:5]):
-            line = f"{i+1}. {e['score']} (R{e['round']})"
-            self.screen.blit(self.small.render(line, True, MUTED), (hsx, jy + 28 + i*20))
+        seq.append((text(self.font, "High Score:", WHITE), (hsx, jy)))
+        for i, surf in enumerate(self._highscore_surfs):
+            seq.append((surf, (hsx, jy + 28 + i*20)))
 
         # help
         help_line = "Click select cards, use buttons for actions"
-        s = self.small.render(help_line, True, MUTED)
-        self.screen.blit(s, (40, H - 36))
+        seq.append((text(self.small, help_line, MUTED), (40, H - 36)))
 
-        # draw buttons
-        for btn in self.buttons:
-            pygame.draw.rect(self.screen, PANEL, btn["rect"], border_radius=8)
-            pygame.draw.rect(self.screen, WHITE, btn["rect"], width=2, border_radius=8)
-            text = "Close Shop" if btn["text"] == "Shop" and self.game.mode == "SHOP" else ("Close Deck" if btn["text"] == "Deck" and self.game.mode == "DECK" else (f"Sort ({self.sort_mode})" if btn["text"] == "Sort" else btn["text"]))
-            text_surf = self.font.render(text, True, WHITE)
-            self.screen.blit(text_surf, (btn["rect"].centerx - text_surf.get_width()//2, btn["rect"].centery - text_surf.get_height()//2))
+        # buttons go out in the same batch as the HUD text
+        if self._button_key != (self.game.mode, self.sort_mode):
+            self.refresh_buttons()
+        seq.extend((btn["surf"], btn["rect"].topleft) for btn in self.buttons)
+        self.blit_many(seq)
 
     def draw_shop(self):
         # backdrop
-        overlay = pygame.Surface((W, H), pygame.SRCALPHA)
-        overlay.fill((0,0,0,160))
-        self.screen.blit(overlay, (0,0))
+        self.screen.blit(self._overlay, (0,0))
         title = self.big.render("SHOP", True, WHITE)
         self.screen.blit(title, (W//2 - title.get_width()//2, 80))
-        for i, r in enumerate(self.shop_rects):
-            pygame.draw.rect(self.screen, PANEL, r, border_radius=14)
-            pygame.draw.rect(self.screen, (0,0,0), r, width=2, border_radius=14)
-            it = self.shop_items[i]
-            name = self.font.render(it.name, True, WHITE)
-            desc = self.small.render(it.desc, True, MUTED)
-            price = self.font.render(f"${it.price}", True, YELLOW)
-            self.screen.blit(name, (r.x+12, r.y+12))
-            self.screen.blit(desc, (r.x+12, r.y+48))
-            self.screen.blit(price, (r.right-12-price.get_width(), r.bottom-12-price.get_height()))
+        self.blit_many(list(zip(self._shop_item_surfs, (r.topleft for r in self.shop_rects))))
         # Close Shop button
         pygame.draw.rect(self.screen, PANEL, self.close_button_rect, border_radius=8)
         pygame.draw.rect(self.screen, WHITE, self.close_button_rect, width=2, border_radius=8)
@@ -970,44 +1076,40 @@ class App:
         self.screen.blit(close_text, (self.close_button_rect.centerx - close_text.get_width()//2, self.close_button_rect.centery - close_text.get_height()//2))
 
     def draw_gameover(self):
-        overlay = pygame.Surface((W, H), pygame.SRCALPHA)
-        overlay.fill((0,0,0,160))
-        self.screen.blit(overlay, (0,0))
+        self.screen.blit(self._overlay, (0,0))
         title = self.big.render("GAME OVER", True, RED)
         info = self.font.render("Use New Run button to start a new run", True, WHITE)
         self.screen.blit(title, (W//2 - title.get_width()//2, H//2 - 40))
         self.screen.blit(info, (W//2 - info.get_width()//2, H//2 + 8))
     def draw_deck(self):
         # backdrop
-        overlay = pygame.Surface((W, H), pygame.SRCALPHA)
-        overlay.fill((0,0,0,160))
-        self.screen.blit(overlay, (0,0))
+        self.screen.blit(self._overlay, (0,0))
         title = self.big.render("DECK VIEW", True, WHITE)
         self.screen.blit(title, (W//2 - title.get_width()//2, 80))
 
         # Show deck count
         deck_count = len(self.deck.cards)
         discard_count = len(self.deck.discard)
-        deck_text = self.font.render(f"Cards in Deck: {deck_count}", True, WHITE)
-        discard_text = self.font.render(f"Cards in Discard: {discard_count}", True, WHITE)
+        deck_text = self._text(self.font, f"Cards in Deck: {deck_count}", WHITE)
+        discard_text = self._text(self.font, f"Cards in Discard: {discard_count}", WHITE)
         self.screen.blit(deck_text, (100, 140))
         self.screen.blit(discard_text, (100, 180))
 
-        # Group cards by suit and sort each group by rank descending
-        all_cards = list(self.deck.cards)
-        suit_groups = DefaultDict(list)
-        for card in all_cards:
-            suit_groups[card.suit].append(card)
-        y = 220
-        for suit in SUITS:
-            if suit in suit_groups:
-                cards = sorted(suit_groups[suit], key=lambda c: c.value(), reverse=True)
-                line = " ".join(c.show() for c in cards)
-                card_text = self.small.render(f"{suit}: {line}", True, MUTED)
-                self.screen.blit(card_text, (100, y))
-                y += 20
-                if y > H - 100:  # limit to screen
-                    break
+        # Cards grouped by suit, rank descending; lines re-render only when the deck changed
+        suit_groups = self.deck.by_suit()
+        if suit_groups is not self._deck_view_src:
+            lines = []
+            y = 220
+            for suit in SUITS:
+                if suit in suit_groups:
+                    line = " ".join([c.show() for c in suit_groups[suit]])
+                    lines.append((self.small.render(f"{suit}: {line}", True, MUTED), (100, y)))
+                    y += 20
+                    if y > H - 100:  # limit to screen
+                        break
+            self._deck_view_src = suit_groups
+            self._deck_view_lines = lines
+        self.blit_many(self._deck_view_lines)
 
         # Close Deck button
         pygame.draw.rect(self.screen, PANEL, self.close_deck_button_rect, border_radius=8)
@@ -1019,47 +1121,76 @@ class App:
 
     # ---------------------- Main Loop ------------------------
     def run(self):
+        pushed = True
+        # Loop-invariant lookups bound once; game/player/hand objects can be replaced, so those stay per frame
+        screen, tick, get_events = self.screen, self.clock.tick, pygame.event.get
+        selected, dirty, game = self.selected, self.dirty, self.game
+        blit_many, card_surface, layout_hand = self.blit_many, self.card_surface, self.layout_hand
+        clickable_bbox = self.clickable_bbox
         while True:
-            dt = self.clock.tick(60) / 1000.0
-            for e in pygame.event.get():
+            # Idle frames (nothing pushed last frame) tick at a lower rate
+            dt = tick(60 if pushed else 30) / 1000.0
+            for e in get_events(HANDLED_EVENTS):
                 if e.type == pygame.QUIT:
                     pygame.quit(); sys.exit(0)
+                if e.type == pygame.VIDEOEXPOSE:
+                    self.invalidate()
                 if e.type == pygame.MOUSEBUTTONDOWN and e.button == 1:
+                    # One box test rejects clicks on empty space before the per-rect hit tests
+                    if not clickable_bbox().collidepoint(e.pos):
+                        continue
                     # Check buttons first (always available)
                     for btn in self.buttons:
                         if btn["rect"].collidepoint(e.pos):
                             btn["action"]()
+                            self.invalidate()
                             break
                     else:
                         # If not button, check mode-specific clicks
-                        if self.game.mode == "PLAY":
-                            rects = self.layout_hand()
+                        mode = game.mode
+                        if mode == "PLAY":
+                            rects = layout_hand()
                             for i, r in enumerate(rects):
                                 if r.collidepoint(e.pos):
                                     self.toggle_select(i)
+                                    self.invalidate(r)
                                     break
-                        elif self.game.mode == "SHOP":
+                        elif mode == "SHOP":
                             self.click_shop(e.pos)
-                        elif self.game.mode == "DECK":
+                            self.invalidate()
+                        elif mode == "DECK":
                             self.click_deck(e.pos)
+                            self.invalidate()
+
 
+            # State only changes on input, so an idle frame has nothing new to draw or push
+            if not (self.full_redraw or dirty):
+                pushed = False
+                continue
 
             # draw
-            self.screen.fill(BG)
+            mode = game.mode
+            screen.fill(BG)
             self.draw_hud()
 
-            rects = self.layout_hand()
-            for i, c in enumerate(self.player.hand.cards):
-                self.draw_card(rects[i], c, i in self.selected)
-
+            rects = layout_hand()
+            blit_many([(card_surface(c, i in selected), rects[i].topleft)
+                       for i, c in enumerate(self.player.hand.cards)])
 
-            if self.game.mode == "SHOP":
+            if mode == "SHOP":
                 self.draw_shop()
-            elif self.game.mode == "GAMEOVER":
+            elif mode == "GAMEOVER":
                 self.draw_gameover()
-            elif self.game.mode == "DECK":
+            elif mode == "DECK":
                 self.draw_deck()
 
-            pygame.display.flip()
+            # Push only what changed: whole window on mode/state changes, card rects on selection
+            pushed = True
+            if self.full_redraw:
+                pygame.display.update()
+            elif dirty:
+                pygame.display.update(dirty)
+            self.full_redraw = False
+            dirty.clear()
 if __name__ == "__main__":
     App().run()